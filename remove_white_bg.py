@@ -1,12 +1,60 @@
 """
 Remove White Background from PNG Images
 This script converts white backgrounds to transparent in all PNG images
+
+Usage:
+    python remove_white_bg.py            # process every asset folder once
+    python remove_white_bg.py --watch    # keep running and process new/changed PNGs
 """
 
-from PIL import Image
+from PIL import Image, ImageChops
+import argparse
 import os
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
+try:
+    # Optional: watchdog uses inotify on Linux. Without it we fall back to polling.
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+# Base directory and folders to process
+BASE_DIR = Path("public/assets")
+FOLDERS = [
+    "souls",
+    "categories",
+    "badges",
+    "concepts"
+]
+
+def make_white_transparent(img, threshold=240):
+    """
+    Return an RGBA copy of an image with near-white pixels made transparent
+
+    Args:
+        img: PIL image
+        threshold: RGB value above which pixels are considered "white" (default 240)
+    """
+    # Convert to RGBA if not already
+    img = img.convert("RGBA")
+
+    # Build a mask of pixels where R, G and B are all above the threshold.
+    # Done per channel in C (point/multiply) instead of a per-pixel Python loop.
+    lut = [255 if value > threshold else 0 for value in range(256)]
+    r, g, b, _ = (band.point(lut) for band in img.split())
+    mask = ImageChops.multiply(ImageChops.multiply(r, g), b)
+
+    # If pixel is white (or close to white), make it transparent
+    img.paste((255, 255, 255, 0), mask=mask)
+    return img
+
 def remove_white_background(image_path, threshold=240):
     """
     Remove white background from an image and make it transparent
@@ -17,34 +65,23 @@ def remove_white_background(image_path, threshold=240):
     """
     try:
         # Open image
-        img = Image.open(image_path)
-
-        # Convert to RGBA if not already
-        img = img.convert("RGBA")
-
-        # Get pixel data
-        datas = img.getdata()
-
-        # Create new pixel data
-        new_data = []
-        for item in datas:
-            # If pixel is white (or close to white), make it transparent
-            if item[0] > threshold and item[1] > threshold and item[2] > threshold:
-                # Make transparent
-                new_data.append((255, 255, 255, 0))
-            else:
-                # Keep original
-                new_data.append(item)
-
-        # Update image data
-        img.putdata(new_data)
+        img = make_white_transparent(Image.open(image_path), threshold)
 
         # Save image (overwrite original)
         img.save(image_path, "PNG")
         print(f"[OK] Processed: {os.path.basename(image_path)}")
+        return True
 
     except Exception as e:
         print(f"[ERROR] Error processing {os.path.basename(image_path)}: {str(e)}")
+        return False
+
+def find_png_files(directory):
+    """
+    List the PNG files in a directory, matching the extension case-insensitively
+    """
+    return sorted(path for path in Path(directory).iterdir()
+                  if path.is_file() and path.suffix.lower() == ".png")
 
 def process_directory(directory, threshold=240):
     """
@@ -61,7 +98,7 @@ def process_directory(directory, threshold=240):
         return
 
     # Find all PNG files
-    png_files = list(directory.glob("*.png"))
+    png_files = find_png_files(directory)
 
     if not png_files:
         print(f"No PNG files found in: {directory}")
@@ -73,36 +110,351 @@ def process_directory(directory, threshold=240):
     for png_file in png_files:
         remove_white_background(str(png_file), threshold)
 
+def _file_signature(path):
+    """
+    Return (mtime_ns, size) for a file, or None if it no longer exists
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _ignore_sigint():
+    """
+    Worker initializer: leave Ctrl+C to the main process, which shuts the pool down
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def _warm_up():
+    """
+    No-op task used to start worker processes before the first change arrives
+    """
+    return os.getpid()
+
+def _process_asset(image_path, threshold):
+    """
+    Worker task: remove the background of a single asset
+
+    Returns a (status, signature, message) tuple:
+        ("ok", signature of our own write, None)
+        ("changed", None, None) if the file was replaced while processing
+        ("error", signature of the file we read, error message)
+    """
+    before = _file_signature(image_path)
+    try:
+        with Image.open(image_path) as source:
+            img = make_white_transparent(source, threshold)
+    except Exception as e:
+        return ("error", before, str(e))
+
+    # Don't overwrite a newer version that landed while we were working
+    if _file_signature(image_path) != before:
+        return ("changed", None, None)
+
+    try:
+        with open(image_path, "wb") as f:
+            img.save(f, "PNG")
+            f.flush()
+            # Signature of exactly what we wrote, before anyone else can touch it
+            stat = os.fstat(f.fileno())
+    except Exception as e:
+        return ("error", before, str(e))
+    return ("ok", (stat.st_mtime_ns, stat.st_size), None)
+
+class AssetWatcher(FileSystemEventHandler):
+    """
+    Watch the asset folders and reprocess only the PNGs that changed
+
+    File events are debounced: a path is processed once no new event has
+    arrived for `debounce` seconds, or as soon as the writer closes it when
+    the platform reports close events. In polling mode a path is only queued
+    once its signature has stayed the same for two polls in a row. A file
+    that can't be read yet is retried quietly; an error is only reported if
+    it still fails after it has stopped changing.
+    """
+
+    # Seconds to wait before retrying a file that could not be read
+    RETRY_DELAY = 1.0
+
+    def __init__(self, base_dir, folders, threshold=240, debounce=0.3,
+                 poll_interval=1.0, workers=2):
+        self.base_dir = Path(base_dir)
+        self.folders = [(self.base_dir / folder).resolve() for folder in folders]
+        self.threshold = threshold
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.workers = workers
+
+        self._lock = threading.Lock()
+        self._pending = {}      # path -> time of last event
+        self._in_flight = {}    # path -> (future, start time)
+        self._written = {}      # path -> signature of our own last write
+        self._known = {}        # path -> last seen signature, compared by _poll
+        self._changed = set()   # paths whose signature changed on the last poll
+        self._failed = {}       # path -> signature of the last unreadable version
+        self._missing = []      # asset folders that don't exist yet
+        self._observer = None
+        self._pool = None
+
+    # -- event intake ---------------------------------------------------
+
+    def _is_asset(self, path):
+        path = Path(path)
+        return path.suffix.lower() == ".png" and path.parent in self.folders
+
+    def _queue(self, path, delay=0.0):
+        path = str(Path(path).resolve())
+        if not self._is_asset(path):
+            return
+        with self._lock:
+            self._pending[path] = time.monotonic() + delay
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self._queue(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self._queue(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self._queue(event.dest_path)
+
+    def on_closed(self, event):
+        # The writer is done: skip the debounce wait
+        if not event.is_directory:
+            self._queue(event.src_path, delay=-self.debounce)
+
+    def _poll(self):
+        """
+        Polling fallback: compare file signatures against the last scan
+        """
+        for folder in self.folders:
+            if not folder.exists():
+                continue
+            for png_file in find_png_files(folder):
+                path = str(png_file)
+                signature = _file_signature(path)
+                if signature is None:
+                    continue
+                if self._known.get(path) != signature:
+                    # Still changing: wait for the next poll to confirm it settled
+                    self._known[path] = signature
+                    self._changed.add(path)
+                elif path in self._changed:
+                    self._changed.discard(path)
+                    self._queue(path)
+
+    def _check_missing_folders(self):
+        """
+        Start watching asset folders that were created after startup
+        """
+        for folder in list(self._missing):
+            if not folder.is_dir():
+                continue
+            self._missing.remove(folder)
+            self.folders.append(folder)
+            print(f"Now watching {folder.name}")
+            if self._observer is not None:
+                self._observer.schedule(self, str(folder), recursive=False)
+                # Files written before the folder was scheduled have no events
+                for png_file in find_png_files(folder):
+                    self._queue(png_file)
+
+    # -- processing -----------------------------------------------------
+
+    def _start_pool(self):
+        """
+        Start the worker pool and wait for every worker to be ready
+        """
+        self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                         initializer=_ignore_sigint)
+        # Start the worker processes now so the first change is fast
+        for future in [self._pool.submit(_warm_up) for _ in range(self.workers)]:
+            future.result()
+
+    def _submit(self, path):
+        """
+        Submit a path to the pool, restarting the pool if a worker died
+        """
+        try:
+            return self._pool.submit(_process_asset, path, self.threshold)
+        except BrokenProcessPool:
+            print("[ERROR] A worker process died, restarting the worker pool")
+            self._pool.shutdown(wait=False)
+            self._start_pool()
+            return self._pool.submit(_process_asset, path, self.threshold)
+
+    def _collect(self, path, future, started):
+        """
+        Handle the result of a finished worker task
+        """
+        name = os.path.basename(path)
+        try:
+            status, signature, message = future.result()
+        except Exception as e:
+            print(f"[ERROR] Worker failed on {name}: {str(e)}")
+            return
+
+        if status == "ok":
+            self._failed.pop(path, None)
+            self._written[path] = signature
+            self._known[path] = signature
+            elapsed_ms = (time.monotonic() - started) * 1000
+            print(f"[OK] Processed: {name} ({elapsed_ms:.0f} ms)")
+        elif status == "error":
+            if path in self._failed and self._failed[path] == signature:
+                # Unchanged since the last failed attempt: it's really broken
+                del self._failed[path]
+                print(f"[ERROR] Error processing {name}: {message}")
+            else:
+                # Most likely still being written: try again shortly
+                self._failed[path] = signature
+                self._queue(path, delay=self.RETRY_DELAY)
+        # "changed": the newer version has its own pending event
+
+    def _dispatch(self):
+        """
+        Submit settled paths to the pool and collect finished results
+        """
+        for path, (future, started) in list(self._in_flight.items()):
+            if future.done():
+                del self._in_flight[path]
+                self._collect(path, future, started)
+
+        now = time.monotonic()
+        with self._lock:
+            ready = [path for path, last_event in self._pending.items()
+                     if now - last_event >= self.debounce
+                     and path not in self._in_flight]
+            for path in ready:
+                del self._pending[path]
+
+        for path in ready:
+            signature = _file_signature(path)
+            if signature is None:
+                continue
+            # Skip the event generated by our own save
+            if self._written.get(path) == signature:
+                continue
+            future = self._submit(path)
+            self._in_flight[path] = (future, now)
+
+    def run(self):
+        """
+        Run until interrupted with Ctrl+C
+        """
+        self._missing = [folder for folder in self.folders if not folder.is_dir()]
+        self.folders = [folder for folder in self.folders if folder not in self._missing]
+        if not self.folders and not self.base_dir.exists():
+            print(f"Error: Assets directory not found at {self.base_dir}")
+            return
+
+        # Prime the polling baseline so existing files are not reprocessed
+        if Observer is None:
+            for folder in self.folders:
+                for png_file in find_png_files(folder):
+                    self._known[str(png_file)] = _file_signature(str(png_file))
+
+        self._start_pool()
+        try:
+            if Observer is not None:
+                self._observer = Observer()
+                for folder in self.folders:
+                    self._observer.schedule(self, str(folder), recursive=False)
+                self._observer.start()
+                print(f"Watching with filesystem events ({type(self._observer).__name__})")
+            else:
+                print(f"watchdog not installed, polling every {self.poll_interval}s")
+
+            print(f"Folders: {', '.join(folder.name for folder in self.folders) or '(none yet)'}")
+            if self._missing:
+                print(f"Waiting for: {', '.join(folder.name for folder in self._missing)}")
+            print("Press Ctrl+C to stop")
+            print("-" * 50)
+
+            last_poll = 0.0
+            try:
+                while True:
+                    if time.monotonic() - last_poll >= self.poll_interval:
+                        self._check_missing_folders()
+                        if self._observer is None:
+                            self._poll()
+                        last_poll = time.monotonic()
+                    self._dispatch()
+                    time.sleep(0.05)
+            except KeyboardInterrupt:
+                print("\nStopping watcher...")
+            finally:
+                if self._observer is not None:
+                    self._observer.stop()
+                    self._observer.join()
+        finally:
+            self._pool.shutdown(cancel_futures=True)
+
+def _positive_int(value):
+    """
+    argparse type: integer of at least 1
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+def _non_negative_float(value):
+    """
+    argparse type: float of at least 0
+    """
+    number = float(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative, got {value}")
+    return number
+
 def main():
     """
     Main function to process all asset folders
     """
+    parser = argparse.ArgumentParser(description="Remove white backgrounds from 2HLABS assets")
+    parser.add_argument("--threshold", type=int, default=240,
+                        help="RGB value above which pixels are considered white (default 240)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and process PNGs as they are added or changed")
+    parser.add_argument("--debounce", type=_non_negative_float, default=0.3,
+                        help="Seconds to wait after the last file event before processing (default 0.3)")
+    parser.add_argument("--poll-interval", type=_non_negative_float, default=1.0,
+                        help="Seconds between scans for changed files (without watchdog) and new asset folders (default 1.0)")
+    parser.add_argument("--workers", type=_positive_int, default=2,
+                        help="Number of worker processes kept warm in watch mode (default 2)")
+    args = parser.parse_args()
+
     print("=" * 50)
     print("White Background Remover for 2HLABS Assets")
     print("=" * 50)
 
-    # Base directory
-    base_dir = Path("public/assets")
-
-    if not base_dir.exists():
-        print(f"Error: Assets directory not found at {base_dir}")
+    if not BASE_DIR.exists():
+        print(f"Error: Assets directory not found at {BASE_DIR}")
         return
 
-    # Folders to process
-    folders = [
-        "souls",
-        "categories",
-        "badges",
-        "concepts"
-    ]
+    if args.watch:
+        AssetWatcher(
+            BASE_DIR,
+            FOLDERS,
+            threshold=args.threshold,
+            debounce=args.debounce,
+            poll_interval=args.poll_interval,
+            workers=args.workers,
+        ).run()
+        return
 
     # Process each folder
     total_processed = 0
-    for folder in folders:
-        folder_path = base_dir / folder
+    for folder in FOLDERS:
+        folder_path = BASE_DIR / folder
         if folder_path.exists():
-            png_count = len(list(folder_path.glob("*.png")))
-            process_directory(folder_path, threshold=240)
+            png_count = len(find_png_files(folder_path))
+            process_directory(folder_path, threshold=args.threshold)
             total_processed += png_count
         else:
             print(f"\nSkipping {folder} (not found)")